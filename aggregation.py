@@ -3,15 +3,22 @@
 # Scalable aggregation + data cleaning for UIDAI datasets
 # ============================================================
 
+import hashlib
 import pandas as pd
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 from pathlib import Path
-import re
-import unicodedata
 
 # ------------------------------------------------------------
 # 1. TEXT NORMALIZATION UTILITIES
 # ------------------------------------------------------------
 
+# Regex kernel options are built once, not on every chunk.
+# RE2 "\w" is ASCII-only; spell out Python's unicode word class.
+_PUNCT_RE = pc.ReplaceSubstringOptions(r"[^\p{L}\p{N}_\s]", " ")
+_WS_RE = pc.ReplaceSubstringOptions(r"\s+", " ")
+
 def normalize_text(series: pd.Series) -> pd.Series:
     """
     Normalize text by:
@@ -19,17 +26,28 @@ def normalize_text(series: pd.Series) -> pd.Series:
     - lowercasing
     - removing punctuation
     - collapsing multiple spaces
+
+    Runs on Arrow compute kernels instead of a per-value Python loop.
     """
-    return (
-        series
-        .astype(str)
-        .apply(lambda x: unicodedata.normalize("NFKD", x))
-        .str.lower()
-        .str.replace(r"[^\w\s]", " ", regex=True)
-        .str.replace(r"\s+", " ", regex=True)
-        .str.strip()
+    arr = pa.array(series.astype(str), type=pa.string())
+    arr = pc.utf8_normalize(arr, form="NFKD")
+    arr = pc.utf8_lower(arr)
+    arr = pc.replace_substring_regex(arr, options=_PUNCT_RE)
+    arr = pc.replace_substring_regex(arr, options=_WS_RE)
+    arr = pc.utf8_trim_whitespace(arr)
+
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(arr),
+        index=series.index,
+        name=series.name,
     )
 
+def clean_district(series: pd.Series) -> pd.Series:
+    """
+    Normalized, title-cased district names.
+    """
+    return normalize_text(series).str.title()
+
 # ------------------------------------------------------------
 # 2. CANONICAL STATE MASTER (INDIA)
 # ------------------------------------------------------------
@@ -77,94 +95,183 @@ STATE_MASTER = {
     "puducherry": "Puducherry",
 }
 
+def canonical_state(series: pd.Series) -> pd.Series:
+    """
+    Maps raw state names onto STATE_MASTER values (NaN if unknown).
+    Most values only differ by case/padding, so a plain lookup runs
+    first and the full normalizer only sees the misses.
+    """
+    mapped = series.astype(str).str.lower().str.strip().map(STATE_MASTER)
+    miss = mapped.isna()
+    if miss.any():
+        mapped.loc[miss] = (
+            normalize_text(series.loc[miss])
+            .map(STATE_MASTER)
+        )
+
+    return mapped
+
+# Date formats tried in order, per value; a value matching none of
+# them is dropped with its row. Two-digit years come first: "%Y"
+# would read "01-03-25" as year 25, while "%y" cannot match a
+# four-digit year and gives 2025 as pd.to_datetime did.
+DATE_FORMATS = [
+    "%d-%m-%y", "%d/%m/%y",
+    "%d-%m-%Y", "%d/%m/%Y", "%Y-%m-%d",
+]
+
 # ------------------------------------------------------------
 # 3. MAIN AGGREGATION FUNCTION
 # ------------------------------------------------------------
 
-def aggregate_folder(
+def map_unique_batch(func):
+    """
+    Wraps a pandas Series -> Series cleaner for map_batches: it runs on
+    each batch's distinct values only, and the results are mapped back
+    onto every row (null where the cleaner gives NaN). Raw state and
+    district columns repeat heavily, so this shrinks the work from
+    rows to unique values.
+    """
+    def apply(batch: pl.Series) -> pl.Series:
+        uniques = batch.drop_nulls().unique()
+        cleaned = pl.from_pandas(func(uniques.to_pandas()))
+
+        return batch.replace_strict(
+            uniques, cleaned, default=None, return_dtype=pl.String
+        )
+
+    return apply
+
+def scan_folder(
     folder_path: str,
     group_cols: list,
-    sum_cols: list,
-    chunksize: int = 200_000
-) -> pd.DataFrame:
+    sum_cols: list
+) -> pl.LazyFrame:
     """
-    Reads large CSV files in chunks, cleans data, normalizes
-    state/district names, and aggregates numerics.
-
-    Parameters
-    ----------
-    folder_path : str
-        Path to folder containing CSV shards
-    group_cols : list
-        Columns to group by (e.g. date, state, district)
-    sum_cols : list
-        Numeric columns to sum
-    chunksize : int
-        Chunk size for large file processing
+    Cleans and aggregates all CSV shards in a folder as one lazy
+    Polars plan: dates are parsed with DATE_FORMATS, states mapped
+    onto STATE_MASTER, districts normalized, and sum_cols summed per
+    group_cols key. Scan, cleaning and group_by run multithreaded on
+    collect().
+
+    Every column is read as text; counts that do not parse as numbers
+    count as 0 instead of failing the file. Rows whose date or state
+    cannot be resolved are dropped.
+
+    Each shard is scanned on its own and matched by column name, so
+    shards may order their headers differently or lack a column,
+    which then reads as null.
     """
 
-    aggregated_chunks = []
-
-    for file in Path(folder_path).glob("*.csv"):
-        print(f"Processing: {file.name}")
-
-        for chunk in pd.read_csv(file, chunksize=chunksize):
-
-            # -----------------------------
-            # DATE CLEANING (MIXED FORMATS)
-            # -----------------------------
-            chunk['date'] = pd.to_datetime(
-                chunk['date'],
-                dayfirst=True,
-                errors='coerce'
-            )
-            chunk = chunk.dropna(subset=['date'])
-
-            # -----------------------------
-            # STATE CLEANING (CANONICAL)
-            # -----------------------------
-            chunk['state'] = normalize_text(chunk['state'])
-            chunk['state'] = chunk['state'].map(STATE_MASTER)
-            chunk = chunk.dropna(subset=['state'])
-
-            # -----------------------------
-            # DISTRICT CLEANING
-            # -----------------------------
-            chunk['district'] = (
-                normalize_text(chunk['district'])
-                .str.title()
-            )
-
-            # -----------------------------
-            # SAFE NUMERIC CONVERSION
-            # -----------------------------
-            for col in sum_cols:
-                chunk[col] = pd.to_numeric(
-                    chunk[col],
-                    errors='coerce'
-                ).fillna(0)
-
-            # -----------------------------
-            # AGGREGATION
-            # -----------------------------
-            agg = (
-                chunk
-                .groupby(group_cols, as_index=False)[sum_cols]
-                .sum()
-            )
-
-            aggregated_chunks.append(agg)
-
-    # -----------------------------
-    # FINAL COMBINE
-    # -----------------------------
-    final_df = (
-        pd.concat(aggregated_chunks, ignore_index=True)
-        .groupby(group_cols, as_index=False)
-        .sum()
+    columns = group_cols + sum_cols
+    scans = []
+    for file in sorted(Path(folder_path).glob("*.csv")):
+        scan = pl.scan_csv(file, infer_schema=False)
+        present = scan.collect_schema().names()
+        scans.append(scan.select([col for col in columns if col in present]))
+
+    if not scans:
+        raise ValueError(f"No CSV files found in {folder_path}")
+
+    lf = pl.concat(scans, how="diagonal_relaxed")
+
+    lf = lf.with_columns(
+        pl.coalesce([
+            pl.col("date").str.strptime(pl.Datetime("us"), fmt, strict=False)
+            for fmt in DATE_FORMATS
+        ]),
+        pl.col("state").map_batches(
+            map_unique_batch(canonical_state),
+            return_dtype=pl.String,
+            is_elementwise=True
+        ),
+        pl.col("district").map_batches(
+            map_unique_batch(clean_district),
+            return_dtype=pl.String,
+            is_elementwise=True
+        ),
+        *[
+            pl.col(col).cast(pl.Float64, strict=False).fill_null(0)
+            for col in sum_cols
+        ],
     )
 
-    return final_df
+    return (
+        lf
+        .drop_nulls(["date", "state"])
+        .group_by(group_cols)
+        .agg([pl.col(col).sum() for col in sum_cols])
+    )
+
+# ------------------------------------------------------------
+# 4. AGGREGATE CACHE
+# ------------------------------------------------------------
+
+CACHE_DIR = "processed_data/_cache"
+
+def folder_fingerprint(folder_path: str, *parts) -> str:
+    """
+    Cheap content key for a CSV folder: file names, sizes and mtimes,
+    plus this module's source and any extra parts (e.g. columns), so
+    edited shards or changed cleaning rules give a new key.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+
+    for file in sorted(Path(folder_path).glob("*.csv")):
+        stat = file.stat()
+        digest.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+    digest.update(repr(parts).encode())
+
+    return digest.hexdigest()[:16]
+
+def cached_scan_folders(jobs: list, cache_dir: str = CACHE_DIR) -> list:
+    """
+    scan_folder for several (folder_path, group_cols, sum_cols) jobs,
+    backed by a Parquet cache of each aggregated output. Unchanged
+    folders are read back from the cache instead of being re-parsed;
+    the misses are collected together with pl.collect_all, so
+    independent folders aggregate concurrently.
+    """
+    cache_paths = [
+        Path(cache_dir)
+        / f"{Path(folder_path).name}_"
+          f"{folder_fingerprint(folder_path, group_cols, sum_cols)}.parquet"
+        for folder_path, group_cols, sum_cols in jobs
+    ]
+
+    misses = []
+    for job, cache_path in zip(jobs, cache_paths):
+        if cache_path.exists():
+            print(f"Using cached aggregate: {cache_path}")
+        else:
+            misses.append((job, cache_path))
+
+    if misses:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+
+        for (folder_path, _, _), _ in misses:
+            print(f"Aggregating: {folder_path}")
+
+        frames = pl.collect_all(
+            [scan_folder(*job) for job, _ in misses],
+            engine="streaming"
+        )
+
+        # Written under a temporary name so an interrupted run never
+        # leaves a partial file behind the final cache key; entries for
+        # the folder's older keys are removed once the new one exists
+        for frame, ((folder_path, _, _), cache_path) in zip(frames, misses):
+            tmp_path = cache_path.with_suffix(".tmp")
+            frame.write_parquet(tmp_path, compression="zstd")
+            tmp_path.replace(cache_path)
+
+            prefix = Path(folder_path).name
+            for stale in Path(cache_dir).glob(f"{prefix}_*.parquet"):
+                if stale != cache_path and stale.stem.rsplit("_", 1)[0] == prefix:
+                    stale.unlink()
+
+    return [pl.scan_parquet(cache_path) for cache_path in cache_paths]
 
 # ============================================================
 # END OF FILE
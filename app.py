@@ -3,26 +3,39 @@
 # ============================================================
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import plotly.express as px
 from dash import Dash, dcc, html, Input, Output
-from statsmodels.tsa.arima.model import ARIMA
 
 # ------------------------------------------------------------
 # 1. LOAD DATA
 # ------------------------------------------------------------
 
-df = pd.read_csv("processed_data/master_uidai_table.csv")
-df['date'] = pd.to_datetime(df['date'])
-
-# ---------------- SAFE METRICS ----------------
-df['total_enrolments'] = df['total_enrolments'].replace(0, 1)
-
-df['child_ratio'] = df.get('age_0_5', 0) / df['total_enrolments']
-
-update_cols = [c for c in df.columns if c.startswith('demo_') or c.startswith('bio_')]
-df['update_burden'] = df[update_cols].sum(axis=1) if update_cols else 0
+def read_parquet(path, dictionary_cols=None):
+    """
+    Memory-mapped, multithreaded Parquet read. Dictionary columns
+    load as pandas categoricals so groupbys run on integer codes;
+    everything else stays Arrow-backed.
+    """
+    table = pq.read_table(
+        path,
+        memory_map=True,
+        use_threads=True,
+        read_dictionary=dictionary_cols
+    )
+    return table.to_pandas(
+        types_mapper=lambda t: (
+            None if pa.types.is_dictionary(t) else pd.ArrowDtype(t)
+        )
+    )
 
-df['policy_alert'] = df['update_burden'] > (0.5 * df['total_enrolments'])
+# Derived metrics come from master_table.py; precompute.py only
+# trims the table to the columns used here
+df = read_parquet(
+    "processed_data/master.parquet",
+    dictionary_cols=['state', 'district']
+)
 
 # ------------------------------------------------------------
 # 2. KPI VALUES
@@ -33,17 +46,39 @@ TOTAL_UPDATES = int(df['update_burden'].sum())
 ALERT_DISTRICTS = int(df['policy_alert'].sum())
 STATES_COUNT = df['state'].nunique()
 
+# Rows are kept sorted by state with a state -> row-range index, so
+# callbacks slice positionally instead of re-scanning or copying
+df = df.sort_values('state', kind='stable').reset_index(drop=True)
+
+# observed=True: the Parquet dictionary may hold states with no rows
+state_slices = {
+    s: slice(idx[0], idx[-1] + 1)
+    for s, idx in df.groupby('state', sort=False, observed=True).indices.items()
+    if len(idx)
+}
+
+# Enrolment trends are precomputed; callbacks only look them up
+national_ts = read_parquet("processed_data/national_ts.parquet")
+
+state_ts = read_parquet(
+    "processed_data/state_ts.parquet",
+    dictionary_cols=['state']
+)
+
+ts_by_state = {
+    s: g.drop(columns='state').reset_index(drop=True)
+    for s, g in state_ts.groupby('state', sort=False, observed=True)
+}
+
 # ------------------------------------------------------------
 # 3. FORECAST (ALL INDIA)
 # ------------------------------------------------------------
 
-ts = df.groupby('date')['total_enrolments'].sum().sort_index()
-
-model = ARIMA(ts, order=(1, 1, 1))
-forecast = model.fit().forecast(steps=30)
-
-forecast_df = forecast.reset_index()
-forecast_df.columns = ['date', 'forecast_enrolments']
+# Fitted offline by forecasting.py; re-run it when the data changes
+forecast_df = pd.read_csv(
+    "processed_data/30_day_enrolment_forecast.csv",
+    parse_dates=['date']
+)
 
 # ------------------------------------------------------------
 # 4. DASH APP SETUP
@@ -110,7 +145,7 @@ app.layout = html.Div(
             [
                 html.Label("Select State"),
                 dcc.Dropdown(
-                    options=[{'label': s, 'value': s} for s in sorted(df['state'].unique())],
+                    options=[{'label': s, 'value': s} for s in sorted(state_slices)],
                     placeholder="All India",
                     id='state_filter',
                     clearable=True
@@ -162,10 +197,10 @@ app.layout = html.Div(
 )
 def update_dashboard(selected_state):
 
-    data = df if not selected_state else df[df['state'] == selected_state]
+    data = df if not selected_state else df.iloc[state_slices[selected_state]]
 
     # -------- Enrollment Trend --------
-    ts_actual = data.groupby('date')['total_enrolments'].sum().reset_index()
+    ts_actual = national_ts if not selected_state else ts_by_state[selected_state]
     fig_ts = px.line(
         ts_actual,
         x='date',
@@ -3,7 +3,11 @@
 # Unified data ingestion for UIDAI datasets
 # ============================================================
 
-import pandas as pd
+import csv
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from pathlib import Path
 
 # ------------------------------------------------------------
@@ -17,7 +21,7 @@ ENROLMENT_DIR = f"{RAW_DATA_DIR}/aadhar_enrolment"
 DEMOGRAPHIC_DIR = f"{RAW_DATA_DIR}/aadhar_demographic"
 BIOMETRIC_DIR = f"{RAW_DATA_DIR}/aadhar_biometric"
 
-CHUNKSIZE = 200_000
+BLOCK_SIZE = 64 << 20
 
 # Ensure output directory exists
 Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
@@ -26,36 +30,52 @@ Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 # 2. GENERIC INGESTION FUNCTION
 # ------------------------------------------------------------
 
-def ingest_folder(folder_path: str, chunksize: int = CHUNKSIZE) -> pd.DataFrame:
+def ingest_folder(folder_path: str, block_size: int = BLOCK_SIZE) -> ds.Dataset:
     """
-    Reads all CSV files from a folder in chunks and concatenates them
-    into a single DataFrame.
+    Opens all CSV files from a folder as one lazy Arrow dataset.
+    Nothing is parsed until the dataset is scanned, so callers can
+    project columns and consume record batches one at a time.
+
+    The schema is the union of every shard's header, with all columns
+    read as strings (empty fields as null). Inferring types from the
+    first shard would reject later shards whose values differ, e.g. a
+    pincode column that is empty in one file and filled in the next.
 
     Parameters
     ----------
     folder_path : str
         Path to folder containing CSV files
-    chunksize : int
-        Number of rows per chunk
+    block_size : int
+        Bytes of CSV parsed per record batch
 
     Returns
     -------
-    pd.DataFrame
-        Concatenated DataFrame
+    ds.Dataset
+        Lazy dataset over the folder's CSV files; use
+        .to_table().to_pandas() where a DataFrame is really needed.
+        Columns a shard lacks read as null.
     """
 
-    frames = []
+    files = sorted(str(file) for file in Path(folder_path).glob("*.csv"))
+
+    if not files:
+        raise ValueError(f"No CSV files found in {folder_path}")
 
-    for file in Path(folder_path).glob("*.csv"):
-        print(f"Ingesting: {file.name}")
+    # Only the header line of each shard is read here
+    columns = {}
+    for file in files:
+        print(f"Ingesting: {Path(file).name}")
+        with open(file, newline="", encoding="utf-8-sig") as f:
+            columns.update(dict.fromkeys(next(csv.reader(f), [])))
 
-        for chunk in pd.read_csv(file, chunksize=chunksize):
-            frames.append(chunk)
+    schema = pa.schema([(col, pa.string()) for col in columns])
 
-    if not frames:
-        raise ValueError(f"No CSV files found in {folder_path}")
+    csv_format = ds.CsvFileFormat(
+        read_options=pacsv.ReadOptions(block_size=block_size),
+        convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+    )
 
-    return pd.concat(frames, ignore_index=True)
+    return ds.dataset(files, schema=schema, format=csv_format)
 
 # ------------------------------------------------------------
 # 3. INGEST UIDAI DATASETS
@@ -66,33 +86,47 @@ def ingest_uidai_data():
     Ingest enrolment, demographic, and biometric datasets
     """
 
-    enrolment_df = ingest_folder(ENROLMENT_DIR)
-    demographic_df = ingest_folder(DEMOGRAPHIC_DIR)
-    biometric_df = ingest_folder(BIOMETRIC_DIR)
+    enrolment_ds = ingest_folder(ENROLMENT_DIR)
+    demographic_ds = ingest_folder(DEMOGRAPHIC_DIR)
+    biometric_ds = ingest_folder(BIOMETRIC_DIR)
 
-    return enrolment_df, demographic_df, biometric_df
+    return enrolment_ds, demographic_ds, biometric_ds
 
 # ------------------------------------------------------------
 # 4. SAVE RAW INGESTED DATA
 # ------------------------------------------------------------
 
-def save_raw_outputs(enrolment_df, demographic_df, biometric_df):
+def save_dataset(dataset: ds.Dataset, path: str) -> int:
     """
-    Saves raw ingested datasets for auditing/debugging
+    Streams a dataset into one Zstd Parquet file batch by batch,
+    never holding the full table in memory. Returns the number of
+    rows written.
     """
 
-    enrolment_df.to_csv(
-        f"{OUTPUT_DIR}/raw_enrolment.csv", index=False
-    )
-    demographic_df.to_csv(
-        f"{OUTPUT_DIR}/raw_demographic.csv", index=False
-    )
-    biometric_df.to_csv(
-        f"{OUTPUT_DIR}/raw_biometric.csv", index=False
+    rows = 0
+    with pq.ParquetWriter(path, dataset.schema, compression="zstd") as writer:
+        for batch in dataset.to_batches():
+            writer.write_batch(batch)
+            rows += batch.num_rows
+
+    return rows
+
+def save_raw_outputs(enrolment_ds, demographic_ds, biometric_ds):
+    """
+    Saves raw ingested datasets for auditing/debugging as
+    Zstd-compressed Parquet; returns the row count of each
+    """
+
+    rows = (
+        save_dataset(enrolment_ds, f"{OUTPUT_DIR}/raw_enrolment.parquet"),
+        save_dataset(demographic_ds, f"{OUTPUT_DIR}/raw_demographic.parquet"),
+        save_dataset(biometric_ds, f"{OUTPUT_DIR}/raw_biometric.parquet"),
     )
 
     print("✅ Raw UIDAI datasets saved successfully")
 
+    return rows
+
 # ------------------------------------------------------------
 # 5. MAIN EXECUTION
 # ------------------------------------------------------------
@@ -101,14 +135,17 @@ if __name__ == "__main__":
 
     print("🚀 Starting UIDAI data ingestion...")
 
-    enrolment_df, demographic_df, biometric_df = ingest_uidai_data()
+    enrolment_ds, demographic_ds, biometric_ds = ingest_uidai_data()
 
-    print("📊 Ingestion Summary")
-    print("Enrolment:", enrolment_df.shape)
-    print("Demographic:", demographic_df.shape)
-    print("Biometric:", biometric_df.shape)
+    # Row counts come from the single pass that writes the raw copies
+    enrolment_rows, demographic_rows, biometric_rows = save_raw_outputs(
+        enrolment_ds, demographic_ds, biometric_ds
+    )
 
-    save_raw_outputs(enrolment_df, demographic_df, biometric_df)
+    print("📊 Ingestion Summary")
+    print("Enrolment:", (enrolment_rows, len(enrolment_ds.schema)))
+    print("Demographic:", (demographic_rows, len(demographic_ds.schema)))
+    print("Biometric:", (biometric_rows, len(biometric_ds.schema)))
 
     print("✅ UIDAI data ingestion completed")
 
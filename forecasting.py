@@ -1,41 +1,47 @@
 # ============================================================
 # forecasting.py
-# 30-day Aadhaar Enrolment Forecast (ARIMA)
+# 30-day Aadhaar Enrolment Forecast (AutoReg)
 # ============================================================
 
+import numpy as np
 import pandas as pd
-from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.ar_model import AutoReg
 
 # ------------------------------------------------------------
 # 1. LOAD DATA
 # ------------------------------------------------------------
 
-df = pd.read_csv("processed_data/master_uidai_table.csv")
-df["date"] = pd.to_datetime(df["date"])
+df = pd.read_parquet(
+    "processed_data/master_uidai_table.parquet",
+    columns=["date", "total_enrolments"]
+)
 
 # ------------------------------------------------------------
 # 2. BUILD TIME SERIES (ALL INDIA)
 # ------------------------------------------------------------
 
-ts = (
-    df.groupby("date")["total_enrolments"]
-    .sum()
-    .sort_index()
-)
+# Scatter-add every row straight into a dense daily array, which
+# also fills missing days with 0 without a groupby or reindex
+days = df["date"].to_numpy().astype("datetime64[D]")
+start = days.min()
+day_idx = (days - start).astype(np.int64)
 
-# Ensure continuous daily frequency
-ts = ts.asfreq("D", fill_value=0)
+daily = np.zeros(day_idx.max() + 1, dtype=np.int64)
+np.add.at(daily, day_idx, df["total_enrolments"].to_numpy())
+
+ts = pd.Series(
+    daily,
+    index=pd.date_range(start, periods=len(daily), freq="D", name="date"),
+    name="total_enrolments"
+)
 
 # ------------------------------------------------------------
-# 3. TRAIN ARIMA MODEL
+# 3. TRAIN AUTOREGRESSIVE MODEL
 # ------------------------------------------------------------
 
-model = ARIMA(
-    ts,
-    order=(1, 1, 1),
-    enforce_stationarity=False,
-    enforce_invertibility=False
-)
+# One week of lags captures the weekly cycle; AutoReg is fitted by
+# ordinary least squares instead of iterative Kalman-filter MLE
+model = AutoReg(ts, lags=7)
 
 model_fit = model.fit()
 
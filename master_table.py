@@ -3,10 +3,10 @@
 # Build unified UIDAI master analytics table
 # ============================================================
 
-import pandas as pd
+import polars as pl
 from pathlib import Path
 
-from aggregation import aggregate_folder
+from aggregation import cached_scan_folders
 
 # ------------------------------------------------------------
 # 1. PATH CONFIGURATION
@@ -19,123 +19,170 @@ ENROLMENT_DIR = f"{RAW_DATA_DIR}/aadhar_enrolment"
 DEMOGRAPHIC_DIR = f"{RAW_DATA_DIR}/aadhar_demographic"
 BIOMETRIC_DIR = f"{RAW_DATA_DIR}/aadhar_biometric"
 
+KEY_COLS = ["date", "state", "district"]
+
 Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 
 # ------------------------------------------------------------
-# 2. AGGREGATE EACH DATASET
+# 2. COUNT HELPERS
 # ------------------------------------------------------------
 
-print("🚀 Aggregating UIDAI datasets...")
+# Aggregated counts are non-negative and far below 2**32
+COUNT_DTYPE = pl.UInt32
+
+def to_count(expr: pl.Expr) -> pl.Expr:
+    """
+    Rounds source sums to COUNT_DTYPE. A negative or out-of-range sum
+    can only come from bad values in the CSVs, so it becomes 0, like
+    an unparseable token, and report_invalid_counts prints how many.
+    """
+    return expr.round().cast(COUNT_DTYPE, strict=False).fill_null(0)
+
+def report_invalid_counts(name: str, lf: pl.LazyFrame) -> None:
+    """
+    Prints, per count column, how many sums to_count will set to 0.
+    """
+    rounded = pl.col(pl.Float64).round()
+    invalid = (
+        lf.select(
+            (
+                rounded.is_not_null()
+                & ~rounded.is_between(0, COUNT_DTYPE.max())
+            ).sum()
+        )
+        .collect()
+        .row(0, named=True)
+    )
+    for col, n in invalid.items():
+        if n:
+            print(f"⚠️ {name} {col}: {n} negative or out-of-range sums set to 0")
+
+def count_sum(*cols: str) -> pl.Expr:
+    """
+    Adds count columns in Int64 and casts the total back to
+    COUNT_DTYPE strictly. Its inputs are already valid counts, so an
+    overflow means COUNT_DTYPE is too narrow for the data, not a bad
+    row; the build stops instead of zeroing or wrapping the total.
+    """
+    total = pl.col(cols[0]).cast(pl.Int64)
+    for col in cols[1:]:
+        total = total + pl.col(col).cast(pl.Int64)
+    return total.cast(COUNT_DTYPE, strict=True)
 
-# ================= ENROLMENT =================
-print("➡️ Processing Aadhaar Enrolment data")
+# ------------------------------------------------------------
+# 3. AGGREGATE EACH DATASET
+# ------------------------------------------------------------
+
+# Each step below only extends a lazy Polars plan; the joins and
+# derived columns all execute together at collect(). Per-folder
+# aggregates are cached under processed_data/_cache, so only the
+# folders whose CSV files changed are parsed again, and those are
+# aggregated concurrently.
+print("🚀 Aggregating UIDAI datasets...")
 
-enrolment_df = aggregate_folder(
-    folder_path=ENROLMENT_DIR,
-    group_cols=["date", "state", "district"],
-    sum_cols=["age_0_5", "age_5_17", "age_18_greater"]
+enrolment_lf, demographic_lf, biometric_lf = cached_scan_folders([
+    (ENROLMENT_DIR, KEY_COLS, ["age_0_5", "age_5_17", "age_18_greater"]),
+    (DEMOGRAPHIC_DIR, KEY_COLS, ["demo_age_5_17", "demo_age_17_"]),
+    (BIOMETRIC_DIR, KEY_COLS, ["bio_age_5_17", "bio_age_17_"]),
+])
+
+for name, lf in [
+    ("Enrolment", enrolment_lf),
+    ("Demographic", demographic_lf),
+    ("Biometric", biometric_lf),
+]:
+    report_invalid_counts(name, lf)
+
+enrolment_lf, demographic_lf, biometric_lf = (
+    lf.with_columns(to_count(pl.col(pl.Float64)))
+    for lf in (enrolment_lf, demographic_lf, biometric_lf)
 )
 
+# ================= ENROLMENT =================
 # Total enrolments
-enrolment_df["total_enrolments"] = (
-    enrolment_df["age_0_5"]
-    + enrolment_df["age_5_17"]
-    + enrolment_df["age_18_greater"]
+enrolment_lf = enrolment_lf.with_columns(
+    count_sum("age_0_5", "age_5_17", "age_18_greater")
+    .alias("total_enrolments")
 )
 
 # ================= DEMOGRAPHIC UPDATES =================
-print("➡️ Processing Demographic Update data")
-
-demographic_df = aggregate_folder(
-    folder_path=DEMOGRAPHIC_DIR,
-    group_cols=["date", "state", "district"],
-    sum_cols=["demo_age_5_17", "demo_age_17_"]
-)
-
 # Rename for clarity
-demographic_df.rename(
-    columns={
-        "demo_age_5_17": "demo_5_17",
-        "demo_age_17_": "demo_18_plus",
-    },
-    inplace=True,
-)
+demographic_lf = demographic_lf.rename({
+    "demo_age_5_17": "demo_5_17",
+    "demo_age_17_": "demo_18_plus",
+})
 
 # ================= BIOMETRIC UPDATES =================
-print("➡️ Processing Biometric Update data")
-
-biometric_df = aggregate_folder(
-    folder_path=BIOMETRIC_DIR,
-    group_cols=["date", "state", "district"],
-    sum_cols=["bio_age_5_17", "bio_age_17_"]
-)
-
 # Rename for clarity
-biometric_df.rename(
-    columns={
-        "bio_age_5_17": "bio_5_17",
-        "bio_age_17_": "bio_18_plus",
-    },
-    inplace=True,
-)
+biometric_lf = biometric_lf.rename({
+    "bio_age_5_17": "bio_5_17",
+    "bio_age_17_": "bio_18_plus",
+})
 
 # ------------------------------------------------------------
-# 3. MERGE INTO MASTER TABLE
+# 4. MERGE INTO MASTER TABLE
 # ------------------------------------------------------------
 
 print("🔗 Merging datasets into master table")
 
-master_df = (
-    enrolment_df
-    .merge(demographic_df, on=["date", "state", "district"], how="left")
-    .merge(biometric_df, on=["date", "state", "district"], how="left")
-)
+# Only the right-hand update counts can be missing after the left joins
+UPDATE_COLS = ["demo_5_17", "demo_18_plus", "bio_5_17", "bio_18_plus"]
 
-master_df.fillna(0, inplace=True)
+# nulls_equal: unknown (null) districts must still match each other,
+# as they did with pandas merge; Polars joins skip null keys otherwise
+master_lf = (
+    enrolment_lf
+    .join(demographic_lf, on=KEY_COLS, how="left", nulls_equal=True)
+    .join(biometric_lf, on=KEY_COLS, how="left", nulls_equal=True)
+    .with_columns(pl.col(UPDATE_COLS).fill_null(0))
+)
 
 # ------------------------------------------------------------
-# 4. DERIVED ANALYTICS FEATURES
+# 5. DERIVED ANALYTICS FEATURES
 # ------------------------------------------------------------
 
 print("🧠 Creating derived metrics")
 
-# Prevent divide-by-zero
-master_df["total_enrolments"] = master_df["total_enrolments"].replace(0, 1)
-
-# Update burden index
-update_cols = [
-    "demo_5_17",
-    "demo_18_plus",
-    "bio_5_17",
-    "bio_18_plus",
-]
-
-master_df["update_burden"] = master_df[update_cols].sum(axis=1)
-
-# Child enrolment ratio
-master_df["child_ratio"] = master_df["age_0_5"] / master_df["total_enrolments"]
+# Update burden index (nulls were already filled by the merge step)
+master_lf = master_lf.with_columns(
+    count_sum(*UPDATE_COLS).alias("update_burden")
+)
 
-# Policy alert flag (configurable threshold)
-master_df["policy_alert"] = (
-    master_df["update_burden"] > (0.5 * master_df["total_enrolments"])
+master_lf = master_lf.with_columns(
+    # Child enrolment ratio; zero-enrolment rows get 0 instead of
+    # having total_enrolments itself overwritten to dodge the division
+    pl.when(pl.col("total_enrolments") > 0)
+    .then(pl.col("age_0_5") / pl.col("total_enrolments"))
+    .otherwise(0.0)
+    .cast(pl.Float32)
+    .alias("child_ratio"),
+
+    # Policy alert flag (configurable threshold)
+    (
+        pl.col("update_burden") > (0.5 * pl.col("total_enrolments"))
+    ).alias("policy_alert"),
 )
 
+master_df = master_lf.collect(engine="streaming")
+
 # ------------------------------------------------------------
-# 5. FINAL SANITY CHECKS
+# 6. FINAL SANITY CHECKS
 # ------------------------------------------------------------
 
 print("📊 Master table summary")
-print("Rows:", master_df.shape[0])
-print("Columns:", master_df.shape[1])
-print("States:", master_df["state"].nunique())
+print("Rows:", master_df.height)
+print("Columns:", master_df.width)
+print("States:", master_df["state"].n_unique())
 print("Date range:", master_df["date"].min(), "to", master_df["date"].max())
 
 # ------------------------------------------------------------
-# 6. SAVE OUTPUT
+# 7. SAVE OUTPUT
 # ------------------------------------------------------------
 
-output_path = f"{OUTPUT_DIR}/master_uidai_table.csv"
-master_df.to_csv(output_path, index=False)
+# Columnar output: readers load only the columns they need and
+# get typed dates back without re-parsing
+output_path = f"{OUTPUT_DIR}/master_uidai_table.parquet"
+master_df.write_parquet(output_path, compression="zstd")
 
 print(f"✅ Master UIDAI table saved to {output_path}")
 print("🏁 Master table generation completed successfully")
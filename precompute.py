@@ -0,0 +1,81 @@
+# ============================================================
+# precompute.py
+# Materialize dashboard inputs to Parquet once, offline
+# ============================================================
+
+import pyarrow.parquet as pq
+
+# ------------------------------------------------------------
+# 1. CONFIGURATION
+# ------------------------------------------------------------
+
+DATA_PATH = "processed_data/master_uidai_table.parquet"
+OUTPUT_DIR = "processed_data"
+
+MASTER_PARQUET = f"{OUTPUT_DIR}/master.parquet"
+NATIONAL_TS_PARQUET = f"{OUTPUT_DIR}/national_ts.parquet"
+STATE_TS_PARQUET = f"{OUTPUT_DIR}/state_ts.parquet"
+
+# The only master table columns app.py reads
+DASHBOARD_COLS = [
+    "state",
+    "district",
+    "total_enrolments",
+    "update_burden",
+    "policy_alert",
+]
+
+PARQUET_OPTIONS = {
+    "compression": "zstd",
+}
+
+# ------------------------------------------------------------
+# 2. LOAD MASTER TABLE
+# ------------------------------------------------------------
+
+print("🚀 Precomputing dashboard inputs...")
+
+# update_burden, child_ratio and policy_alert are derived once, in
+# master_table.py; this script only trims the table to the dashboard
+# columns and builds the trend series from it
+table = pq.read_table(DATA_PATH)
+
+# ------------------------------------------------------------
+# 3. NATIONAL AND STATE TIME SERIES
+# ------------------------------------------------------------
+
+national_ts = (
+    table.group_by("date")
+    .aggregate([("total_enrolments", "sum")])
+    .rename_columns(["date", "total_enrolments"])
+    .sort_by("date")
+)
+
+state_ts = (
+    table.group_by(["state", "date"])
+    .aggregate([("total_enrolments", "sum")])
+    .rename_columns(["state", "date", "total_enrolments"])
+    .sort_by([("state", "ascending"), ("date", "ascending")])
+)
+
+# ------------------------------------------------------------
+# 4. SAVE OUTPUTS
+# ------------------------------------------------------------
+
+pq.write_table(
+    table.select(DASHBOARD_COLS),
+    MASTER_PARQUET,
+    use_dictionary=["state", "district"],
+    **PARQUET_OPTIONS
+)
+pq.write_table(national_ts, NATIONAL_TS_PARQUET, **PARQUET_OPTIONS)
+pq.write_table(
+    state_ts,
+    STATE_TS_PARQUET,
+    use_dictionary=["state"],
+    **PARQUET_OPTIONS
+)
+
+print(f"✅ Dashboard master table saved to {MASTER_PARQUET}")
+print(f"✅ National time series saved to {NATIONAL_TS_PARQUET}")
+print(f"✅ State time series saved to {STATE_TS_PARQUET}")